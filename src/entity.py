@@ -1,10 +1,16 @@
 import pygame
-from pygame.sprite import Sprite
+from pygame.sprite import DirtySprite
 from pygame.math import Vector2
 
 
-class Entity(Sprite):
-    """Base class for game objects."""
+class Entity(DirtySprite):
+    """Base class for game objects.
+
+    Entities are dirty sprites, so a level redraws only those of them which were
+    changed since the previous frame (see `pygame.sprite.LayeredDirty`).
+    """
+
+    __slots__ = ("image", "rect")
 
     def __init__(self, image: pygame.Surface, rect: pygame.Rect):
         """Initialize the entity object.
@@ -33,12 +39,14 @@ class Entity(Sprite):
         bool
             Returns True if there is a collision between self and other, False otherwise.
         """
-        return pygame.sprite.collide_rect(self, other)
+        return self.rect.colliderect(other.rect)
 
 
 class MovableEntity(Entity):
     """Base class for movable entities."""
 
+    __slots__ = ("speed",)
+
     def __init__(self, image: pygame.Surface, rect: pygame.Rect, speed: Vector2):
         """Initialize the movable entity object.
 
@@ -60,7 +68,15 @@ class MovableEntity(Entity):
 
 
 class Block(Entity):
-    """Class for destroyable blocks."""
+    """Class for destroyable blocks.
+
+    Attributes
+    ----------
+    is_destroyed : bool
+        Whether the block is destroyed or not.
+    """
+
+    __slots__ = ("is_destroyed",)
 
     def __init__(self, image: pygame.Surface, rect: pygame.Rect):
         """Initialize the block object.
@@ -73,26 +89,18 @@ class Block(Entity):
             The rectangle that contains position and borders of the block.
         """
         super().__init__(image, rect)
-        self.__is_destroyed = False
-
-    def is_destroyed(self) -> bool:
-        """Return whether the block is destroyed or not.
-
-        Returns
-        -------
-        bool
-            Returns True if the block is destroyed, False otherwise.
-        """
-        return self.__is_destroyed
+        self.is_destroyed = False
 
     def set_is_destroyed(self):
         """Mark the block as destroyed."""
-        self.__is_destroyed = True
+        self.is_destroyed = True
 
 
 class Ball(MovableEntity):
     """Class for ball entity."""
 
+    __slots__ = ()
+
     def __init__(self, image: pygame.Surface, rect: pygame.Rect, speed: Vector2):
         """Initialize the ball object.
 
@@ -114,6 +122,8 @@ class Platform(MovableEntity):
     Note: Platform moves only left or right, so vertical speed is ignored.
     """
 
+    __slots__ = ()
+
     def __init__(self, image: pygame.Surface, rect: pygame.Rect, speed: Vector2):
         """Initialize the platform object.
 
@@ -1,10 +1,13 @@
-import os
+import pathlib
 import pygame
 import helpers
 import level
 from pygame.math import Vector2
 from typing import List
 
+# directory with assets files of the game
+ASSETS = pathlib.Path(__file__).resolve().parent.parent / "assets"
+
 
 class Game:
     """Game application class."""
@@ -35,23 +38,46 @@ class Game:
         """
         pygame.init()
         pygame.mixer.init()
+        # only these events are handled, so the others (mouse motion, window
+        # events etc) are not even queued
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed([pygame.QUIT, pygame.KEYDOWN])
         self.lifes = lifes
-        self.music = pygame.mixer.Sound(
-            os.path.join(os.getcwd(), "assets", "game-music.mp3")
-        )
+        # the music is streamed instead of being decoded into memory at once
+        self.music = pygame.mixer.music
+        self.music.load(ASSETS / "game-music.mp3")
         self.music.play(-1)
 
         self.__edges: helpers.Edges = edges
 
-        self.__screen: pygame.Surface = pygame.display.set_mode(
-            (self.__edges.width, self.__edges.height)
-        )
+        # the game is rendered at the resolution of its edges and SDL scales it to
+        # the actual window size, so a larger window does not mean more pixels to
+        # fill and blit; vsync is available only for such SCALED (or OPENGL)
+        # display mode and not every video driver supports it
+        screen_size = (self.__edges.width, self.__edges.height)
+        screen_flags = pygame.SCALED | pygame.RESIZABLE
+        try:
+            self.__screen: pygame.Surface = pygame.display.set_mode(
+                screen_size, screen_flags, vsync=1
+            )
+        except pygame.error:
+            self.__screen = pygame.display.set_mode(screen_size, screen_flags)
 
         self.__background_color: tuple[int, int, int] = background_color
-        self.__accent_color: tuple[int, int, int] = tuple(
-            pygame.math.Vector3(255, 255, 255)
-            - pygame.math.Vector3(self.__background_color)
-        )
+        red, green, blue = self.__background_color
+        self.__accent_color: tuple[int, int, int] = (255 - red, 255 - green, 255 - blue)
+
+        # background of the game with the drawn delimiter line, see
+        # `__update_background()`
+        self.__background: pygame.Surface = pygame.Surface(self.__screen.get_size())
+        self.__background_y_of_delimiter: int | None = None
+        # background with the composed menu over it and the transparent menu
+        # image it was composed with, see `__draw_menu()`
+        self.__menu_screen: pygame.Surface | None = None
+        self.__menu_screen_image: pygame.Surface | None = None
+        # sprites group which was drawn on the previous frame; `None` if the
+        # screen was fully repainted (e.g. for the menu)
+        self.__drawn_sprites_group: pygame.sprite.LayeredDirty | None = None
 
         horizontal_alignment: int = round(self.__edges.width * 0.03)
 
@@ -65,23 +91,16 @@ class Game:
         )
         ball_size: int = round(self.__edges.height * 0.03)
 
-        ball_image: pygame.Surface = pygame.image.load(
-            os.path.join(os.getcwd(), "assets", "ball.png")
-        ).convert_alpha(self.__screen)
-        ball_image = pygame.transform.scale(ball_image, (ball_size, ball_size))
-
-        platform_image: pygame.Surface = pygame.image.load(
-            os.path.join(os.getcwd(), "assets", "platform.png")
-        ).convert_alpha(self.__screen)
-        platform_image = pygame.transform.scale(
-            platform_image, (round(self.__edges.width * 0.092), ball_size)
+        ball_image: pygame.Surface = helpers.load_sprite_image(
+            ASSETS / "ball.png", (ball_size, ball_size)
         )
-
-        block_image: pygame.Surface = pygame.image.load(
-            os.path.join(os.getcwd(), "assets", "block.png")
-        ).convert_alpha(self.__screen)
-        block_image = pygame.transform.scale(
-            block_image, (block_width, block_width * 0.45)
+        platform_image: pygame.Surface = helpers.load_sprite_image(
+            ASSETS / "platform.png",
+            (round(self.__edges.width * 0.092), ball_size),
+        )
+        block_image: pygame.Surface = helpers.load_sprite_image(
+            ASSETS / "block.png",
+            (block_width, block_width * 0.45),
         )
 
         self.__images: dict[str, pygame.Surface] = {
@@ -100,23 +119,55 @@ class Game:
             },
         )
 
-        self.__font: pygame.font.Font = pygame.font.Font(
-            os.path.join(os.getcwd(), "assets", "font.ttf"), 20
+        self.__font: pygame.font.Font = helpers.load_font(ASSETS / "font.ttf", 20)
+
+    def __update_background(self, y_of_delimiter: int) -> bool:
+        """Draw the background with the delimiter line if the line has moved.
+
+        Parameters
+        ----------
+        y_of_delimiter : int
+            Says where on Y axis to draw the line that delimiters game area and
+            game counters.
+
+        Returns
+        -------
+        bool
+            Returns True if the background was redrawn, False otherwise.
+        """
+
+        if y_of_delimiter == self.__background_y_of_delimiter:
+            return False
+
+        self.__background.fill(self.__background_color)
+        pygame.draw.line(
+            self.__background,
+            self.__accent_color,
+            (0, y_of_delimiter),
+            (self.__edges.width, y_of_delimiter),
         )
+        self.__background_y_of_delimiter = y_of_delimiter
+        return True
 
     def __draw(
         self,
-        sprites_group: pygame.sprite.Group,
+        sprites_group: pygame.sprite.LayeredDirty,
         labels: List[helpers.Label],
         y_of_delimiter: int,
     ):
         """Update the image of the game.
 
+        Only dirty sprites are redrawn on the screen surface while the same
+        sprites group is drawn frame after frame; the whole group is repainted
+        when the group differs from the group of the previous frame. The display
+        is always flipped as a whole: with the SCALED display mode the screen is
+        presented through a renderer, which uploads the whole texture even when
+        only some areas are updated.
+
         Parameters
         ----------
-        sprites_group : pygame.sprite.Group
-            Game objects that need to be drawn. Pass `None` if no sprites
-            needed to be drawn.
+        sprites_group : pygame.sprite.LayeredDirty
+            Game objects that need to be drawn.
         labels : List[helpers.Label]
             Text label that needs to be drawn.
         y_of_delimiter : int
@@ -124,19 +175,50 @@ class Game:
             game counters.
         """
 
-        self.__screen.fill(self.__background_color)
-        if sprites_group:
-            sprites_group.draw(self.__screen)
+        is_background_updated = self.__update_background(y_of_delimiter)
+        if is_background_updated or sprites_group is not self.__drawn_sprites_group:
+            self.__screen.blit(self.__background, (0, 0))
+            sprites_group.repaint_rect(self.__screen.get_rect())
+            sprites_group.draw(self.__screen, self.__background)
+        else:
+            # counters above the game area may change their text, and labels are
+            # blitted over their previous copies unless their areas are restored,
+            # so the group clears these areas and redraws the sprites inside them
+            sprites_group.repaint_rect(
+                pygame.Rect(0, 0, self.__edges.width, y_of_delimiter)
+            )
+            for label in labels:
+                sprites_group.repaint_rect(label.get_rendered()[1])
+            sprites_group.draw(self.__screen, self.__background)
+        self.__drawn_sprites_group = sprites_group
 
-        for label in labels:
-            self.__screen.blit(*label.get_rendered())
+        # the screen is not locked around the drawing: SDL refuses to blit onto
+        # a locked surface, and blitting keeps the surface lock itself anyway
+        self.__screen.blits([label.get_rendered() for label in labels], doreturn=False)
 
-        pygame.draw.line(
-            self.__screen,
-            self.__accent_color,
-            (0, y_of_delimiter),
-            (self.__edges.width, y_of_delimiter),
-        )
+        pygame.display.flip()
+
+    def __draw_menu(self, menu_image: pygame.Surface, y_of_delimiter: int):
+        """Update the image of the game with the start / pause game menu.
+
+        Parameters
+        ----------
+        menu_image : pygame.Surface
+            Transparent image of the whole screen with the composed menu text.
+        y_of_delimiter : int
+            Says where on Y axis to draw the line that delimiters game area and
+            game counters.
+        """
+
+        # the menu is composed over the background only when one of them
+        # changes, so each menu frame is a single opaque blit
+        is_background_updated = self.__update_background(y_of_delimiter)
+        if is_background_updated or menu_image is not self.__menu_screen_image:
+            self.__menu_screen = self.__background.copy()
+            self.__menu_screen.blit(menu_image, (0, 0))
+            self.__menu_screen_image = menu_image
+        self.__screen.blit(self.__menu_screen, (0, 0))
+        self.__drawn_sprites_group = None
 
         pygame.display.flip()
 
@@ -154,10 +236,15 @@ class Game:
         List[helpers.Label]
         """
 
+        # labels keep their position, so each of them gets its own copy while
+        # the caller's vector is left untouched
+        position = pygame.math.Vector2(start_position)
         menu_labels = []
         for line in menu_text.splitlines():
-            menu_labels.append(helpers.Label(font, start_position, line, color))
-            start_position += (0, menu_labels[-1].get_rendered()[1].height)
+            menu_labels.append(
+                helpers.Label(font, pygame.math.Vector2(position), line, color)
+            )
+            position.y += menu_labels[-1].get_rendered()[1].height
 
         return menu_labels
 
@@ -204,7 +291,7 @@ class Game:
             "A for moving platform to left\n"
             "D for moving platform to right\n"
             "Press ALT to set the game with hardcore mode[1 life]\n"
-            "Press F1 to play or stop music"
+            "Press F1 to pause or resume music"
         )
         menu_labels = Game.__render_menu(
             self.__font,
@@ -214,56 +301,106 @@ class Game:
                 self.__screen.get_width() / 6, self.__screen.get_height() / 4
             ),
         )
+        # the menu is static, so its labels are composed into one image once
+        menu_image = pygame.Surface(self.__screen.get_size(), pygame.SRCALPHA)
+        menu_image.blits(
+            [label.get_rendered() for label in menu_labels], doreturn=False
+        )
 
         running: bool = True
         is_paused: bool = False
         lvl = self.__level_maker.get_level(lifes=self.lifes)
         is_menu_showing: bool = True
         is_music_paused: bool = False
+        shown_score: int | None = None
+        shown_lifes: int | None = None
+
+        def toggle_pause() -> None:
+            nonlocal is_paused, is_menu_showing
+            is_paused = not is_paused
+            is_menu_showing = False
+
+        def quit_game() -> None:
+            nonlocal running
+            running = False
+
+        def reset_level() -> None:
+            nonlocal lvl, is_paused, is_menu_showing
+            lvl = self.__level_maker.get_level()
+            is_paused = not is_paused
+            is_menu_showing = True
+
+        def start_hardcore_level() -> None:
+            nonlocal lvl, is_paused, is_menu_showing
+            lvl = self.__level_maker.get_level(lifes=1)
+            is_paused = not is_paused
+            is_menu_showing = False
+
+        def toggle_music() -> None:
+            nonlocal is_music_paused
+            is_music_paused = not is_music_paused
+            if is_music_paused:
+                self.music.pause()
+            else:
+                self.music.unpause()
+
+        key_handlers = {
+            pygame.K_SPACE: toggle_pause,
+            pygame.K_q: quit_game,
+            pygame.K_DELETE: reset_level,
+            pygame.K_RALT: start_hardcore_level,
+            pygame.K_LALT: start_hardcore_level,
+            pygame.K_F1: toggle_music,
+        }
 
         while running:
-            for event in pygame.event.get():
+            if is_menu_showing or is_paused:
+                # nothing moves while the menu is shown, so the process sleeps
+                # until an event comes (but redraws the menu from time to time)
+                events = [pygame.event.wait(100)] + pygame.event.get()
+            else:
+                events = pygame.event.get()
+
+            for event in events:
                 if event.type == pygame.QUIT:
                     running = False
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_SPACE:
-                        is_paused = not is_paused
-                        is_menu_showing = False
-                    if event.key == pygame.K_q:
-                        running = False
-                    if event.key == pygame.K_DELETE:
-                        lvl = self.__level_maker.get_level()
-                        is_paused = not is_paused
-                        is_menu_showing = True
-                    if event.key == pygame.K_RALT or event.key == pygame.K_LALT:
-                        lvl = self.__level_maker.get_level(lifes=1)
-                        is_paused = not is_paused
-                        is_menu_showing = False
-                    if event.key == pygame.K_F1:
-                        is_music_paused = not is_music_paused
-                        if is_music_paused:
-                            self.music.stop()
-                        else:
-                            self.music.play(-1)
-
-            score_count.set_text(f"Score: {lvl.get_game_state().score}")
-            lifes_count.set_text(f"Lifes: {lvl.get_game_state().lifes}")
+                elif event.type == pygame.KEYDOWN:
+                    handler = key_handlers.get(event.key)
+                    if handler:
+                        handler()
+
+            game_state = lvl.get_game_state()
+            top_edge = lvl.get_top_edge()
+
+            # counters texts are formatted only when their values change
+            if game_state.score != shown_score:
+                shown_score = game_state.score
+                score_count.set_text(f"Score: {shown_score}")
+            if game_state.lifes != shown_lifes:
+                shown_lifes = game_state.lifes
+                lifes_count.set_text(f"Lifes: {shown_lifes}")
 
             labels = [score_count, lifes_count]
 
-            if lvl.get_game_state().is_game_over:
+            if game_state.is_game_over:
                 labels.append(game_over_label)
 
-            elif lvl.get_game_state().is_player_won:
+            elif game_state.is_player_won:
                 labels.append(victory_label)
             elif not is_paused:
                 lvl.update()
 
             if is_menu_showing or is_paused:
-                self.__draw(None, menu_labels, lvl.get_top_edge())
+                self.__draw_menu(menu_image, top_edge)
             else:
-                self.__draw(lvl.get_sprites_group(), labels, lvl.get_top_edge())
+                self.__draw(lvl.get_sprites_group(), labels, top_edge)
 
+            # with vsync the display update itself waits for the vertical blank,
+            # so the tick just caps the game speed on displays with a higher
+            # refresh rate than 60 Hz
             clock.tick(60)
 
+        # loaded fonts and images are bound to the pygame session
+        helpers.load_font.cache_clear()
+        helpers.load_sprite_image.cache_clear()
         pygame.quit()
@@ -1,4 +1,7 @@
+import functools
+import os
 import pygame
+from collections import OrderedDict
 from dataclasses import dataclass
 from pygame.math import Vector2
 
@@ -11,8 +14,67 @@ class Edges:
     height: int
 
 
+@functools.lru_cache(maxsize=32)
+def load_font(path: str | os.PathLike, size: int) -> pygame.font.Font:
+    """Load a font, parsing each font file and size only once.
+
+    Note: cached fonts become unusable after `pygame.quit()`, so clear the cache
+    with `load_font.cache_clear()` before quitting.
+
+    Parameters
+    ----------
+    path : str | os.PathLike
+        Path to the font file.
+    size : int
+        Size of the font.
+
+    Returns
+    -------
+    pygame.font.Font
+        The loaded font.
+    """
+
+    return pygame.font.Font(path, size)
+
+
+@functools.lru_cache(maxsize=32)
+def load_sprite_image(path: str | os.PathLike, size: tuple) -> pygame.Surface:
+    """Load an image, convert it to the display pixel format and scale it, doing
+    it only once for each image file and size.
+
+    The image keeps its per-pixel alpha (sprites have antialiased edges and block
+    images are tinted by multiplying their colors, which would break a color
+    key), but is RLE-accelerated, so its transparent areas are skipped quickly
+    when it is blitted.
+
+    Note: the display mode must be set before loading images.
+
+    Parameters
+    ----------
+    path : str | os.PathLike
+        Path to the image file.
+    size : tuple[int, int]
+        Size to which the image is scaled.
+
+    Returns
+    -------
+    pygame.Surface
+        The loaded image.
+    """
+
+    image = pygame.transform.scale(pygame.image.load(path).convert_alpha(), size)
+    image.set_alpha(255, pygame.RLEACCEL)
+    return image
+
+
 class Label:
-    """Class for drawing text strings."""
+    """Class for drawing text strings.
+
+    Rendered images of the label are cached by their text and color, so setting
+    a previously shown text again does not render it anew.
+    """
+
+    RENDER_CACHE_SIZE = 64
 
     def __init__(
         self,
@@ -40,8 +102,10 @@ class Label:
         self.__text: str = text
         self.color: tuple = color
 
-        self.__text_image: pygame.Surface | None = None
-        self.__text_image_rect: pygame.Rect | None = None
+        self.__rendered: tuple[pygame.Surface, pygame.Rect] | None = None
+        self.__rendered_cache: OrderedDict[
+            tuple[str, tuple], tuple[pygame.Surface, pygame.Rect]
+        ] = OrderedDict()
         self.__render()
 
     def get_rendered(self) -> tuple[pygame.Surface, pygame.Rect]:
@@ -53,26 +117,44 @@ class Label:
             Rendered image of the text and its rectangle.
         """
 
-        return (self.__text_image, self.__text_image_rect)
+        return self.__rendered
 
     def set_text(self, text: str):
         """Update text of the label and update its rendered image and placement rectangle.
 
+        Nothing is done if the text is not changed.
+
         Parameters
         ----------
         text : str
             New text for the label.
         """
 
+        if text == self.__text:
+            return
+
         self.__text = text
         self.__render()
 
     def __render(self):
-        """Render an image of the label text and get its placement rectangle."""
-
-        self.__text_image: pygame.Surface = self.__font.render(
-            self.__text, True, self.color
-        )
-        self.__text_image_rect: pygame.Rect = self.__text_image.get_rect(
-            x=self.__position.x, y=self.__position.y
-        )
+        """Render an image of the label text and get its placement rectangle.
+
+        The least recently used image is evicted from the cache when it holds
+        more than `RENDER_CACHE_SIZE` images.
+        """
+
+        key = (self.__text, tuple(self.color))
+        rendered = self.__rendered_cache.get(key)
+        if rendered is None:
+            text_image = self.__font.render(self.__text, True, self.color)
+            rendered = (
+                text_image,
+                text_image.get_rect(x=self.__position.x, y=self.__position.y),
+            )
+            self.__rendered_cache[key] = rendered
+            if len(self.__rendered_cache) > Label.RENDER_CACHE_SIZE:
+                self.__rendered_cache.popitem(last=False)
+        else:
+            self.__rendered_cache.move_to_end(key)
+
+        self.__rendered = rendered
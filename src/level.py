@@ -1,11 +1,19 @@
 """Create and manage level."""
 
 from dataclasses import dataclass
-import copy
 import pygame
 import entity
 import helpers
-from typing import List
+from typing import Sequence
+
+# Colors of the rows of blocks, from the top row down.
+RAINBOW_COLORS = [
+    (255, 0, 0),  # Red
+    (255, 200, 0),  # Yellow
+    (0, 128, 0),  # Green
+    (0, 0, 255),  # Blue
+    (128, 0, 200),  # Violet
+]
 
 
 class Level:
@@ -19,6 +27,12 @@ class Level:
             position is ignored.
         __edges (pygame.Rect): Rectangle that contains width and height of the level.
         __state (Level.GameState): Game state of the level.
+        __blocks_rects (List[pygame.Rect]): Rectangles of the blocks in the same order
+            as the blocks, for testing collisions against all of them at once.
+        __blocks_top (int): Top of the horizontal band that contains all blocks.
+        __blocks_bottom (int): Bottom of the horizontal band that contains all blocks.
+        __sprites_group (pygame.sprite.LayeredDirty): All game objects of the level.
+            Destroyed blocks are removed from it.
     """
 
     @dataclass
@@ -44,7 +58,7 @@ class Level:
     def __init__(
         self,
         lifes: int,
-        blocks: List[entity.Block],
+        blocks: Sequence[entity.Block],
         platform: entity.Platform,
         ball: entity.Ball,
         edges: pygame.Rect,
@@ -54,7 +68,8 @@ class Level:
 
         Parameters:
             lifes (int): Number of player lives.
-            blocks (List[entity.Block]): List of destroyable blocks.
+            blocks (Sequence[entity.Block]): Destroyable blocks. The sequence itself is not
+                modified by the level.
             platform (entity.Platform): The platform object.
             ball (entity.Ball): The ball object.
             edges (pygame.Rect): The rectangle containing width and height of the level.
@@ -66,13 +81,26 @@ class Level:
         self.__ball = ball
 
         self.__edges = pygame.Rect((0, top_start), (edges.width, edges.height))
+        self.__blocks_rects = [block.rect for block in self.__blocks]
+        self.__update_blocks_band()
+        self.__sprites_group = pygame.sprite.LayeredDirty(
+            self.__platform, self.__ball, *self.__blocks
+        )
 
         self.__state = Level.GameState(
-            ball_released_speed=copy.deepcopy(self.__ball.speed), lifes=lifes
+            ball_released_speed=self.__ball.speed.copy(), lifes=lifes
         )
 
         self.__reset_ball()
 
+    def __update_blocks_band(self) -> None:
+        """Compute the horizontal band of the level which contains all blocks."""
+        if self.__blocks:
+            self.__blocks_top = min(block.rect.top for block in self.__blocks)
+            self.__blocks_bottom = max(block.rect.bottom for block in self.__blocks)
+        else:
+            self.__blocks_top = self.__blocks_bottom = self.__edges.top
+
     def get_top_edge(self) -> int:
         """Return value of the top of game area.
 
@@ -92,7 +120,7 @@ class Level:
         """Release the ball from the platform."""
         if not self.__state.is_ball_released:
             self.__state.is_ball_released = True
-            self.__ball.speed = copy.deepcopy(self.__state.ball_released_speed)
+            self.__ball.speed = self.__state.ball_released_speed.copy()
 
     def get_game_state(self) -> GameState:
         """Return game state of the level.
@@ -102,13 +130,16 @@ class Level:
         """
         return self.__state
 
-    def get_sprites_group(self) -> pygame.sprite.Group:
+    def get_sprites_group(self) -> pygame.sprite.LayeredDirty:
         """Return game objects as one group.
 
+        Only the moved objects are marked as dirty, so drawing of the group
+        redraws only them and the places of the removed blocks.
+
         Returns:
-            pygame.sprite.Group: The group containing all game objects.
+            pygame.sprite.LayeredDirty: The group containing all game objects.
         """
-        return pygame.sprite.Group(self.__platform, self.__ball, *self.__blocks)
+        return self.__sprites_group
 
     def __process_key_presses(self) -> None:
         """Process key presses and update level objects and state correspondingly."""
@@ -130,73 +161,142 @@ class Level:
             self.__platform.speed.x = abs(self.__platform.speed.x)
             do_update()
 
+    def __process_platform_collisions(self) -> None:
+        """Keep the platform inside the level edges."""
+        if self.__platform.rect.right > self.__edges.right:
+            self.__platform.rect.right = self.__edges.right
+            self.__platform.speed.x = -self.__platform.speed.x
+
+        elif self.__platform.rect.left < self.__edges.left:
+            self.__platform.rect.left = self.__edges.left
+            self.__platform.speed.x = -self.__platform.speed.x
+
     def __process_collisions(self) -> None:
         """Process collisions and update objects positions and speeds."""
-        # Checking collision on the X axis
-        self.__ball.rect.x += self.__ball.speed.x
-        if self.__ball.is_collided_with(self.__platform):
-            entity.adjust_on_x_collision(self.__ball, self.__platform)
+        # the ball lies on the platform and does not move until it is released,
+        # so only the platform can collide with something
+        if not self.__state.is_ball_released:
+            self.__process_platform_collisions()
+            return
+
+        # the adjustments of `entity.adjust_on_x_collision` and
+        # `entity.adjust_on_y_collision` are inlined here as this is the hottest
+        # path of the level update; the ball is processed as plain local numbers
+        # and is written back to its rect and speed only once at the end
+        ball_x, ball_y, ball_width, ball_height = self.__ball.rect
+        speed_x, speed_y = self.__ball.speed
+        # the ball position is integer, so it moves by the rounded speed; the
+        # speed itself stays fractional to keep its gradual growth
+        step_x, step_y = round(speed_x), round(speed_y)
+        platform_rect = self.__platform.rect
+        edges = self.__edges
+
+        # the ball can hit only the blocks which overlap the area it sweeps during
+        # this frame, so they are found in one pass over the blocks for both axes;
+        # the whole pass is skipped when the area is outside the blocks band
+        swept_x = min(ball_x, ball_x + step_x)
+        swept_y = min(ball_y, ball_y + step_y)
+        swept_width = ball_width + abs(step_x)
+        swept_height = ball_height + abs(step_y)
+        if (
+            swept_y + swept_height > self.__blocks_top
+            and swept_y < self.__blocks_bottom
+        ):
+            swept_rect = pygame.Rect(swept_x, swept_y, swept_width, swept_height)
+            hittable_blocks = [
+                self.__blocks[i] for i in swept_rect.collidelistall(self.__blocks_rects)
+            ]
+        else:
+            hittable_blocks = []
 
-        elif self.__ball.rect.right > self.__edges.right:
-            self.__ball.rect.right = self.__edges.right
-            self.__ball.speed.x = -self.__ball.speed.x
+        # Checking collision on the X axis
+        ball_x += step_x
+        if platform_rect.colliderect(ball_x, ball_y, ball_width, ball_height):
+            if platform_rect.left < ball_x + ball_width < platform_rect.right:
+                ball_x = platform_rect.left - ball_width
+            else:
+                ball_x = platform_rect.right
+            speed_x = -speed_x
 
-        elif self.__ball.rect.left < self.__edges.left:
-            self.__ball.rect.left = self.__edges.left
-            self.__ball.speed.x = -self.__ball.speed.x
         else:
-            for block in self.__blocks:
-                if self.__ball.is_collided_with(block):
-                    entity.adjust_on_x_collision(self.__ball, block)
-                    block.set_is_destroyed()
+            # clamp the ball back inside the left and right edges and reflect it
+            # with a single test on both overshoots
+            overshoot_right = max(0, ball_x + ball_width - edges.right)
+            overshoot_left = max(0, edges.left - ball_x)
+            if overshoot_right | overshoot_left:
+                ball_x -= overshoot_right - overshoot_left
+                speed_x = -speed_x
+            else:
+                for block in hittable_blocks:
+                    block_rect = block.rect
+                    if block_rect.colliderect(ball_x, ball_y, ball_width, ball_height):
+                        if block_rect.left < ball_x + ball_width < block_rect.right:
+                            ball_x = block_rect.left - ball_width
+                        else:
+                            ball_x = block_rect.right
+                        speed_x = -speed_x
+                        block.set_is_destroyed()
 
         # Checking collision on the Y axis
-        self.__ball.rect.y += self.__ball.speed.y
-        if self.__ball.is_collided_with(self.__platform):
-            entity.adjust_on_y_collision(self.__ball, self.__platform)
-
-        elif self.__ball.rect.bottom > self.__edges.bottom:
+        ball_y += step_y
+        if platform_rect.colliderect(ball_x, ball_y, ball_width, ball_height):
+            if ball_y < platform_rect.top < ball_y + ball_height:
+                ball_y = platform_rect.top - ball_height
+            else:
+                ball_y = platform_rect.bottom
+            speed_y = -speed_y
+
+        elif ball_y + ball_height > edges.bottom:
             self.__reset_ball()
             self.__state.lifes -= 1
+            ball_x, ball_y = self.__ball.rect.topleft
+            speed_x, speed_y = self.__ball.speed
 
-        elif self.__ball.rect.top < self.__edges.top:
-            self.__ball.rect.top = self.__edges.top
-            self.__ball.speed.y = -self.__ball.speed.y
         else:
-            for block in self.__blocks:
-                if self.__ball.is_collided_with(block):
-                    entity.adjust_on_y_collision(self.__ball, block)
-                    block.set_is_destroyed()
+            overshoot_top = max(0, edges.top - ball_y)
+            if overshoot_top:
+                ball_y += overshoot_top
+                speed_y = -speed_y
+            else:
+                for block in hittable_blocks:
+                    block_rect = block.rect
+                    if block_rect.colliderect(ball_x, ball_y, ball_width, ball_height):
+                        if ball_y < block_rect.top < ball_y + ball_height:
+                            ball_y = block_rect.top - ball_height
+                        else:
+                            ball_y = block_rect.bottom
+                        speed_y = -speed_y
+                        block.set_is_destroyed()
 
         is_squeezing_on_y = (
-            self.__ball.rect.bottom < self.__platform.rect.top
-            or self.__ball.rect.top < self.__platform.rect.bottom
-        )
-        is_squeezing_on_x = (
-            self.__ball.rect.right > self.__edges.right
-            or self.__ball.rect.left < self.__edges.left
+            ball_y + ball_height < platform_rect.top or ball_y < platform_rect.bottom
         )
+        is_squeezing_on_x = ball_x + ball_width > edges.right or ball_x < edges.left
         if is_squeezing_on_y and is_squeezing_on_x:
-            self.__ball.rect.top = self.__platform.rect.bottom
+            ball_y = platform_rect.bottom
 
-        if self.__platform.rect.right > self.__edges.right:
-            self.__platform.rect.right = self.__edges.right
-            self.__platform.speed.x = -self.__platform.speed.x
+        self.__ball.rect.topleft = (ball_x, ball_y)
+        self.__ball.speed.update(speed_x, speed_y)
 
-        elif self.__platform.rect.left < self.__edges.left:
-            self.__platform.rect.left = self.__edges.left
-            self.__platform.speed.x = -self.__platform.speed.x
+        self.__process_platform_collisions()
 
     def update(self) -> None:
         """Do updates of the level's state and objects."""
         self.__process_key_presses()
         self.__process_collisions()
-
-        for block in self.__blocks:
-            if block.is_destroyed():
-                self.__blocks.remove(block)
-                self.__state.score += 100
-                self.__ball.speed *= 1.02
+        self.__platform.dirty = 1
+        self.__ball.dirty = 1
+
+        # destroyed blocks are dropped in one pass and their score and ball
+        # speed up are applied at once
+        destroyed_blocks = [block for block in self.__blocks if block.is_destroyed]
+        if destroyed_blocks:
+            self.__blocks = [block for block in self.__blocks if not block.is_destroyed]
+            self.__blocks_rects = [block.rect for block in self.__blocks]
+            self.__sprites_group.remove(*destroyed_blocks)
+            self.__state.score += 100 * len(destroyed_blocks)
+            self.__ball.speed *= 1.02 ** len(destroyed_blocks)
+            self.__update_blocks_band()
 
         if self.__state.lifes < 1:
             self.__state.is_game_over = True
@@ -217,6 +317,8 @@ class LevelMaker:
         __horizontal_alignment (int): Horizontal alignment between blocks.
         __vertical_alignment (int): Vertical alignment between blocks.
         __num_of_rows (int): Number of rows of blocks.
+        __colored_block_images (List[pygame.Surface]): Block images colored in rainbow
+            colors. Rendered once and shared by blocks of all made levels.
     """
 
     def __init__(self, edges: helpers.Edges, images: dict, blocks_layout: dict) -> None:
@@ -240,6 +342,12 @@ class LevelMaker:
         self.__vertical_alignment = blocks_layout["vertical_alignment"]
         self.__num_of_rows = blocks_layout["num_of_rows"]
 
+        self.__colored_block_images = []
+        for color in RAINBOW_COLORS:
+            image = self.__images["block"].copy()
+            image.fill(color, special_flags=pygame.BLEND_MULT)
+            self.__colored_block_images.append(image)
+
     def get_level(self, lifes: int = 4) -> Level:
         """Get a maked and initialized level.
 
@@ -266,29 +374,20 @@ class LevelMaker:
         top_alignment = ball.rect.height * 3
         y = round(ball.rect.height * 2.2 + top_alignment)
 
-        rainbow_colors = [
-            (255, 0, 0),  # Red
-            (255, 200, 0),  # Yellow
-            (0, 128, 0),  # Green
-            (0, 0, 255),  # Blue
-            (128, 0, 200),  # Violet
-        ]
-        colored_block_images = []
-        for color in rainbow_colors:
-            image = self.__images["block"].copy()
-            image.fill(color, special_flags=pygame.BLEND_MULT)
-            colored_block_images.append(image)
+        colored_block_images = self.__colored_block_images
+        block_size = self.__images["block"].get_size()
+        block_width = block_size[0]
 
         blocks = []
         for i in range(0, self.__num_of_rows):
-            while x + self.__images["block"].get_size()[0] < self.__edges.width:
+            while x + block_width < self.__edges.width:
                 blocks.append(
                     entity.Block(
                         image=colored_block_images[i % len(colored_block_images)],
-                        rect=pygame.Rect((x, y), self.__images["block"].get_size()),
+                        rect=pygame.Rect((x, y), block_size),
                     )
                 )
-                x += self.__images["block"].get_size()[0] + self.__horizontal_alignment
+                x += block_width + self.__horizontal_alignment
 
             x = self.__horizontal_alignment
             y += self.__vertical_alignment
@@ -0,0 +1,7 @@
+import os
+
+# set before pygame is imported, so no real display or audio device is opened
+# even if something initializes pygame; the tests themselves need no pygame.init()
+# as Rect, Vector2 and plain Surfaces work without it
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
@@ -1,5 +1,3 @@
-import copy
-
 import pytest
 import pygame
 
@@ -10,35 +8,21 @@ from cicd_labs.src import entity
     "one,other",
     [
         # check collision on the left side
-        (
-            entity.Entity(None, pygame.Rect(5, 5, 10, 10)),
-            entity.Entity(None, pygame.Rect(12, 5, 10, 10)),
-        ),
+        ((5, 5, 10, 10), (12, 5, 10, 10)),
         # check collision on the right side
-        (
-            entity.Entity(None, pygame.Rect(5, 5, 10, 10)),
-            entity.Entity(None, pygame.Rect(-4, 5, 10, 10)),
-        ),
+        ((5, 5, 10, 10), (-4, 5, 10, 10)),
         # check collision on the top side
-        (
-            entity.Entity(None, pygame.Rect(5, 5, 10, 10)),
-            entity.Entity(None, pygame.Rect(5, 14, 10, 10)),
-        ),
+        ((5, 5, 10, 10), (5, 14, 10, 10)),
         # check collision on the bottom side
-        (
-            entity.Entity(None, pygame.Rect(5, 5, 10, 10)),
-            entity.Entity(None, pygame.Rect(5, -4, 10, 10)),
-        ),
+        ((5, 5, 10, 10), (5, -4, 10, 10)),
         # check if entities do not collide
-        pytest.param(
-            entity.Entity(None, pygame.Rect(5, 5, 10, 10)),
-            entity.Entity(None, pygame.Rect(5, 40, 10, 10)),
-            marks=pytest.mark.xfail,
-        ),
+        pytest.param((5, 5, 10, 10), (5, 40, 10, 10), marks=pytest.mark.xfail),
     ],
 )
-def test_entities_collision(one: entity.Entity, other: entity.Entity):
-    assert one.is_collided_with(other)
+def test_entities_collision(one: tuple, other: tuple):
+    one_entity = entity.Entity(None, pygame.Rect(one))
+    other_entity = entity.Entity(None, pygame.Rect(other))
+    assert one_entity.is_collided_with(other_entity)
 
 
 def test_moving_of_movable_entity():
@@ -54,35 +38,29 @@ def test_moving_of_movable_entity():
 
 
 @pytest.mark.parametrize(
-    "platform,expected",
+    "rect_coords,speed,expected_rect_coords",
     [
         # check horizontal movement
-        (
-            entity.Platform(None, pygame.Rect(5, 5, 10, 10), pygame.Vector2(10, 0)),
-            entity.Platform(None, pygame.Rect(15, 5, 10, 10), pygame.Vector2(10, 0)),
-        ),
+        ((5, 5, 10, 10), (10, 0), (15, 5, 10, 10)),
         # check if paddle do not moves vertically
-        pytest.param(
-            entity.Platform(None, pygame.Rect(5, 5, 10, 10), pygame.Vector2(0, 5)),
-            entity.Platform(None, pygame.Rect(5, 10, 10, 10), pygame.Vector2(0, 5)),
-            marks=pytest.mark.xfail,
-        ),
+        pytest.param((5, 5, 10, 10), (0, 5), (5, 10, 10, 10), marks=pytest.mark.xfail),
     ],
 )
-def test_moving_of_platform(platform: entity.Platform, expected: entity.Platform):
+def test_moving_of_platform(
+    rect_coords: tuple, speed: tuple, expected_rect_coords: tuple
+):
+    platform = entity.Platform(None, pygame.Rect(rect_coords), pygame.Vector2(speed))
     platform.move()
-    assert platform.rect == expected.rect
+    assert platform.rect == pygame.Rect(expected_rect_coords)
 
 
 def test_adjusting_on_x_collision():
     static_entity = entity.Block(None, pygame.Rect(10, 5, 10, 10))
 
     speed = pygame.Vector2(10, 0)
-    left_movable_entity = entity.Ball(
-        None, pygame.Rect(5, 5, 10, 10), copy.deepcopy(speed)
-    )
+    left_movable_entity = entity.Ball(None, pygame.Rect(5, 5, 10, 10), speed.copy())
     right_movable_entity = entity.Platform(
-        None, pygame.Rect(19, 5, 10, 10), copy.deepcopy(speed)
+        None, pygame.Rect(19, 5, 10, 10), speed.copy()
     )
 
     entity.adjust_on_x_collision(left_movable_entity, static_entity)
@@ -99,10 +77,10 @@ def test_adjusting_on_y_collision():
 
     speed = pygame.Vector2(0, 10)
     top_movable_entity = entity.MovableEntity(
-        None, pygame.Rect(12, 1, 6, 6), copy.deepcopy(speed)
+        None, pygame.Rect(12, 1, 6, 6), speed.copy()
     )
     bottom_movable_entity = entity.MovableEntity(
-        None, pygame.Rect(12, 12, 6, 6), copy.deepcopy(speed)
+        None, pygame.Rect(12, 12, 6, 6), speed.copy()
     )
 
     # entity.adjust_on_y_collision(top_movable_entity, static_entity)
@@ -0,0 +1,68 @@
+import pytest
+import pygame
+
+from cicd_labs.src import helpers
+
+
+class CountingFont(pygame.font.Font):
+    """Default font which counts how many times a text is rendered."""
+
+    def __init__(self):
+        super().__init__(None, 12)
+        self.renders = 0
+
+    def render(self, *args, **kwargs) -> pygame.Surface:
+        self.renders += 1
+        return super().render(*args, **kwargs)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def font_module():
+    pygame.font.init()
+    yield
+    pygame.font.quit()
+
+
+def test_label_reuses_rendered_text():
+    font = CountingFont()
+    label = helpers.Label(font, pygame.Vector2(0, 0), "a")
+    first_image, _ = label.get_rendered()
+
+    label.set_text("b")
+    label.set_text("a")
+
+    assert label.get_rendered()[0] is first_image
+    assert font.renders == 2
+
+
+def test_label_does_not_render_unchanged_text():
+    font = CountingFont()
+    label = helpers.Label(font, pygame.Vector2(0, 0), "a")
+    rendered = label.get_rendered()
+
+    label.set_text("a")
+
+    assert label.get_rendered() is rendered
+    assert font.renders == 1
+
+
+def test_label_evicts_least_recently_used_text(monkeypatch):
+    monkeypatch.setattr(helpers.Label, "RENDER_CACHE_SIZE", 2)
+    font = CountingFont()
+    label = helpers.Label(font, pygame.Vector2(0, 0), "a")
+    a_image, _ = label.get_rendered()
+    label.set_text("b")
+    b_image, _ = label.get_rendered()
+
+    # "a" is used again, so "b" is the least recently used one
+    label.set_text("a")
+    label.set_text("c")
+    assert font.renders == 3
+
+    label.set_text("a")
+    assert label.get_rendered()[0] is a_image
+    assert font.renders == 3
+
+    label.set_text("b")
+    assert label.get_rendered()[0] is not b_image
+    assert font.renders == 4
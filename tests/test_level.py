@@ -1,191 +1,305 @@
-import copy
+from typing import Sequence
 
 import pytest
 import pygame
 
-from cicd_labs.src import level
-from cicd_labs.src import entity
-
-
-@pytest.fixture(autouse=True)
-def dummy_key_presses(monkeypatch):
-    monkeypatch.setattr(
-        "pygame.key.get_pressed",
-        lambda: {
-            pygame.K_a: False,
-            pygame.K_RCTRL: False,
-            pygame.K_LCTRL: False,
-            pygame.K_a: False,
-            pygame.K_d: False,
-        },
-    )
+from cicd_labs.src import entity, level
+
+# default geometry of the tested levels, tests take copies of these
+_EDGES = pygame.Rect(0, 0, 100, 100)
+_BALL_RECT = pygame.Rect(5, 5, 10, 10)
+_PLATFORM_RECT = pygame.Rect(40, 50, 15, 5)
+_BLOCK_RECT = pygame.Rect(10, 10, 10, 10)
+_BALL_SPEED = pygame.Vector2(10, 10)
+# the level flips the platform speed in place, so platforms get copies of it
+_ZERO = pygame.Vector2(0, 0)
+
+_K_A, _K_D, _K_LCTRL, _K_RCTRL = pygame.K_a, pygame.K_d, pygame.K_LCTRL, pygame.K_RCTRL
+
+# no key is pressed unless a test patches the stub for itself
+_DEFAULT_KEYS = {
+    _K_A: False,
+    _K_RCTRL: False,
+    _K_LCTRL: False,
+    _K_D: False,
+}
+
+
+@pytest.fixture(scope="module", autouse=True)
+def stub_get_pressed():
+    # stubbed once for this module's tests and restored after the last of
+    # them, so tests of other modules see the real keyboard state
+    get_pressed = pygame.key.get_pressed
+    pygame.key.get_pressed = lambda: _DEFAULT_KEYS
+    yield
+    pygame.key.get_pressed = get_pressed
+
+
+# releasing the ball
+_KEYS_RELEASE = {
+    _K_A: True,
+    _K_RCTRL: True,
+    _K_LCTRL: True,
+    _K_D: False,
+}
+# moving the platform to left
+_KEYS_LEFT = {
+    _K_A: True,
+    _K_RCTRL: False,
+    _K_LCTRL: True,
+    _K_D: False,
+}
+# moving the platform to right
+_KEYS_RIGHT = {
+    _K_A: False,
+    _K_RCTRL: False,
+    _K_LCTRL: True,
+    _K_D: True,
+}
+
+
+def _make_level(
+    blocks: Sequence[entity.Block],
+    platform: entity.Platform,
+    ball: entity.Ball,
+    lifes: int = 4,
+    edges: pygame.Rect = _EDGES,
+) -> level.Level:
+    return level.Level(lifes, blocks, platform, ball, edges.copy(), 0)
 
 
 def test_release_ball():
-    platform = entity.Platform(None, pygame.Rect(40, 50, 15, 5), pygame.Vector2(5, 0))
-    ball = entity.Ball(None, pygame.Rect(5, 5, 10, 10), pygame.Vector2(10, 10))
-    ball_speed = pygame.Vector2(10, 10)
-
-    tested_level = level.Level(
-        lifes=4,
-        blocks=[],
-        platform=platform,
-        ball=ball,
-        edges=pygame.Rect(0, 0, 100, 100),
-        top_start=0,
-    )
+    platform = entity.Platform(None, _PLATFORM_RECT.copy(), pygame.Vector2(5, 0))
+    ball = entity.Ball(None, _BALL_RECT.copy(), _BALL_SPEED.copy())
+
+    tested_level = _make_level((), platform, ball)
 
     # initial state
     assert ball.rect.centerx == platform.rect.centerx
     assert ball.rect.bottom == platform.rect.top
-    assert ball.speed == pygame.Vector2(0, 0)
+    assert ball.speed == _ZERO
 
     assert not tested_level.get_game_state().is_ball_released
 
     # after ball release
     tested_level.release_ball()
-    assert ball.speed == ball_speed
+    assert ball.speed == _BALL_SPEED
     assert tested_level.get_game_state().is_ball_released
 
 
-def test_processing_key_presses(monkeypatch):
-    keys_set = [
-        # releasing the ball
-        {
-            pygame.K_a: True,
-            pygame.K_RCTRL: True,
-            pygame.K_LCTRL: True,
-            pygame.K_d: False,
-        },
-        # moving the platform to left
-        {
-            pygame.K_a: False,
-            pygame.K_RCTRL: False,
-            pygame.K_LCTRL: True,
-            pygame.K_a: True,
-            pygame.K_d: False,
-        },
-        # moving the platform to right
-        {
-            pygame.K_a: False,
-            pygame.K_RCTRL: False,
-            pygame.K_LCTRL: True,
-            pygame.K_a: False,
-            pygame.K_d: True,
-        },
-    ]
-    index = (i for i in range(len(keys_set)))
-
-    def get_pygame_presses():
-        return keys_set[next(index)]
-
-    monkeypatch.setattr("pygame.key.get_pressed", get_pygame_presses)
+def test_releasing_ball_by_key_press(monkeypatch):
+    monkeypatch.setattr("pygame.key.get_pressed", lambda: _KEYS_RELEASE)
 
-    platform = entity.Platform(None, pygame.Rect(40, 50, 15, 5), pygame.Vector2(5, 0))
-
-    tested_level = level.Level(
-        lifes=4,
-        blocks=[],
-        platform=platform,
-        ball=entity.Ball(None, pygame.Rect(5, 5, 10, 10), pygame.Vector2(10, 10)),
-        edges=pygame.Rect(0, 0, 100, 100),
-        top_start=0,
+    tested_level = _make_level(
+        (),
+        entity.Platform(None, _PLATFORM_RECT.copy(), pygame.Vector2(5, 0)),
+        entity.Ball(None, _BALL_RECT.copy(), _BALL_SPEED.copy()),
     )
 
-    # realising the ball from the platform
     assert not tested_level.get_game_state().is_ball_released
     tested_level.update()
     assert tested_level.get_game_state().is_ball_released
 
-    speed_x = platform.speed.x
-    tested_level.update()
-    assert tested_level._Level__platform.speed.x == -abs(speed_x)
 
-    tested_level.update()
-    assert tested_level._Level__platform.speed.x == abs(speed_x)
+@pytest.mark.parametrize(
+    "keys,expected_speed_sign",
+    [
+        # moving the platform to left
+        (_KEYS_LEFT, -1),
+        # moving the platform to right
+        (_KEYS_RIGHT, 1),
+    ],
+)
+def test_processing_key_presses(monkeypatch, keys: dict, expected_speed_sign: int):
+    monkeypatch.setattr("pygame.key.get_pressed", lambda: keys)
+
+    # the platform moves the other way until the key is processed
+    platform = entity.Platform(
+        None, _PLATFORM_RECT.copy(), pygame.Vector2(-expected_speed_sign * 5, 0)
+    )
 
+    tested_level = _make_level(
+        (), platform, entity.Ball(None, _BALL_RECT.copy(), _BALL_SPEED.copy())
+    )
+    tested_level.release_ball()
 
-def test_block_logic():
-    block = entity.Block(None, pygame.Rect(10, 10, 10, 10))
-    initial_ball_speed = pygame.Vector2(10, 10)
-    ball = entity.Ball(
-        None, pygame.Rect(5, 15, 5, 5), copy.deepcopy(initial_ball_speed)
+    tested_level.update()
+    assert platform.speed.x == expected_speed_sign * 5
+    assert (platform.rect.x - _PLATFORM_RECT.x) * expected_speed_sign > 0
+
+
+@pytest.mark.parametrize(
+    "scenario",
+    [
+        pytest.param(
+            {
+                # the ball destroys the only block right after its release
+                "block": (10, 10, 10, 10),
+                "ball": (5, 15, 5, 5),
+                "ball_speed": (10, 10),
+                "platform_size": (15, 5),
+                "lifes": 4,
+                "edges": (0, 0, 100, 100),
+                "expected_block_destroyed": True,
+                "expected_score_delta": 100,
+                "expected_speed_grown": True,
+                "expected_won": True,
+                "expected_lifes": 4,
+                "expected_game_over": False,
+            },
+            id="block_destroyed_victory",
+        ),
+        pytest.param(
+            {
+                # the ball falls out of the bottom edge and takes the last life
+                "block": (0, 0, 1, 1),
+                "ball": (5, 2, 5, 5),
+                "ball_speed": (15, 15),
+                "platform_size": (10, 5),
+                "lifes": 1,
+                "edges": (0, 0, 100, 15),
+                "expected_block_destroyed": False,
+                "expected_score_delta": 0,
+                "expected_speed_grown": False,
+                "expected_won": False,
+                "expected_lifes": 0,
+                "expected_game_over": True,
+            },
+            id="life_lost",
+        ),
+    ],
+)
+def test_level_after_ball_release(scenario: dict):
+    block = entity.Block(None, pygame.Rect(scenario["block"]))
+    ball_speed = pygame.Vector2(scenario["ball_speed"])
+    ball = entity.Ball(None, pygame.Rect(scenario["ball"]), ball_speed.copy())
+
+    # the platform is centered right under the ball
+    platform_width, platform_height = scenario["platform_size"]
+    platform = entity.Platform(
+        None,
+        pygame.Rect(
+            ball.rect.centerx - platform_width // 2,
+            ball.rect.bottom,
+            platform_width,
+            platform_height,
+        ),
+        _ZERO.copy(),
     )
 
-    platform = entity.Platform(None, pygame.Rect(5, 15, 15, 5), pygame.Vector2(0, 0))
-    platform.rect.centerx = ball.rect.centerx
-    platform.rect.top = ball.rect.bottom
-
-    tested_level = level.Level(
-        lifes=4,
-        blocks=[block],
-        platform=platform,
-        ball=ball,
-        edges=pygame.Rect(0, 0, 100, 100),
-        top_start=0,
+    tested_level = _make_level(
+        (block,), platform, ball, scenario["lifes"], pygame.Rect(scenario["edges"])
     )
 
-    previous_state = copy.deepcopy(tested_level.get_game_state())
+    previous_score = tested_level.get_game_state().score
 
-    assert not block.is_destroyed()
+    assert not block.is_destroyed
 
     tested_level.release_ball()
     tested_level.update()
 
-    assert block.is_destroyed()
-    assert tested_level.get_game_state().score > previous_state.score
-    # if ball speed is increased
-    assert abs(ball.speed.x) > abs(initial_ball_speed.x) and abs(ball.speed.y) > abs(
-        initial_ball_speed.y
+    game_state = tested_level.get_game_state()
+    assert block.is_destroyed == scenario["expected_block_destroyed"]
+    assert game_state.score - previous_score == scenario["expected_score_delta"]
+    is_speed_grown = ball.speed.length_squared() > ball_speed.length_squared()
+    assert is_speed_grown == scenario["expected_speed_grown"]
+    assert game_state.is_player_won == scenario["expected_won"]
+    assert game_state.lifes == scenario["expected_lifes"]
+    assert game_state.is_game_over == scenario["expected_game_over"]
+
+
+def test_removing_of_all_destroyed_blocks():
+    blocks = (
+        entity.Block(None, _BLOCK_RECT.copy()),
+        entity.Block(None, pygame.Rect(25, 10, 10, 10)),
+        entity.Block(None, pygame.Rect(40, 10, 10, 10)),
     )
+    platform = entity.Platform(None, pygame.Rect(40, 80, 15, 5), pygame.Vector2(5, 0))
 
+    tested_level = _make_level(
+        blocks, platform, entity.Ball(None, _BALL_RECT.copy(), _BALL_SPEED.copy())
+    )
+
+    # destroy two adjacent blocks in the same frame
+    blocks[0].set_is_destroyed()
+    blocks[1].set_is_destroyed()
+    tested_level.update()
 
-def test_victory_after_destroying_all_blocks():
-    block = entity.Block(None, pygame.Rect(10, 10, 10, 10))
-    ball = entity.Ball(None, pygame.Rect(5, 15, 5, 5), pygame.Vector2(10, 10))
+    assert tested_level.get_game_state().score == 200
+    assert len(tested_level.get_sprites_group()) == 3
 
-    platform = entity.Platform(None, pygame.Rect(5, 15, 15, 5), pygame.Vector2(0, 0))
-    platform.rect.centerx = ball.rect.centerx
-    platform.rect.top = ball.rect.bottom
 
-    tested_level = level.Level(
-        lifes=4,
-        blocks=[block],
-        platform=platform,
-        ball=ball,
-        edges=pygame.Rect(0, 0, 100, 100),
-        top_start=0,
+def test_hitting_block_after_removed_one():
+    blocks = (
+        entity.Block(None, _BLOCK_RECT.copy()),
+        entity.Block(None, pygame.Rect(30, 10, 10, 10)),
+        # the target, in a lower row than the removed block
+        entity.Block(None, pygame.Rect(50, 40, 10, 10)),
+        entity.Block(None, pygame.Rect(70, 40, 10, 10)),
     )
+    platform = entity.Platform(None, pygame.Rect(45, 80, 15, 5), _ZERO.copy())
+    # the ball flies straight up from the platform to the target block
+    ball = entity.Ball(None, pygame.Rect(0, 0, 5, 5), pygame.Vector2(0, -10))
 
-    tested_level.release_ball()
+    tested_level = _make_level(blocks, platform, ball)
+
+    # the first block is removed in an earlier frame than the hit
+    blocks[0].set_is_destroyed()
     tested_level.update()
 
-    assert tested_level.get_game_state().is_player_won
+    tested_level.release_ball()
+    for _ in range(3):
+        tested_level.update()
 
+    assert blocks[2].is_destroyed
+    assert not blocks[1].is_destroyed and not blocks[3].is_destroyed
+    assert tested_level.get_game_state().score == 200
+    assert ball.speed.y > 0
 
-def test_ball_is_out_of_bottom_edge_logic():
-    block = entity.Block(None, pygame.Rect(0, 0, 1, 1))
-    ball = entity.Ball(None, pygame.Rect(5, 2, 5, 5), pygame.Vector2(15, 15))
 
-    platform = entity.Platform(
-        None, pygame.Rect(5, ball.rect.bottom, 10, 5), pygame.Vector2(0, 0)
-    )
-    platform.rect.centerx = ball.rect.centerx
-    platform.rect.top = ball.rect.bottom
-
-    tested_level = level.Level(
-        lifes=1,
-        blocks=[block],
-        platform=platform,
-        ball=ball,
-        edges=pygame.Rect(0, 0, 100, 15),
-        top_start=0,
-    )
+def test_ball_bouncing_off_side_edge():
+    platform = entity.Platform(None, pygame.Rect(80, 50, 15, 5), _ZERO.copy())
+    ball = entity.Ball(None, _BALL_RECT.copy(), pygame.Vector2(10, -10))
+    edges = _EDGES.copy()
 
-    previous_state = copy.deepcopy(tested_level.get_game_state())
+    tested_level = _make_level((), platform, ball, edges=edges)
 
     tested_level.release_ball()
     tested_level.update()
 
-    assert previous_state.lifes - tested_level.get_game_state().lifes == 1
-    assert tested_level.get_game_state().is_game_over
+    assert ball.rect.right == edges.right
+    assert ball.speed.x == -10
+
+
+def test_colored_block_images_are_reused_between_levels():
+    level_maker = level.LevelMaker(
+        edges=_EDGES.copy(),
+        images={
+            "platform": pygame.Surface((15, 5)),
+            "ball": pygame.Surface((5, 5)),
+            "block": pygame.Surface((10, 5)),
+        },
+        blocks_layout={
+            "horizontal_alignment": 5,
+            "vertical_alignment": 10,
+            "num_of_rows": 2,
+        },
+    )
+
+    first_images = [s.image for s in level_maker.get_level().get_sprites_group()]
+    second_images = [s.image for s in level_maker.get_level().get_sprites_group()]
+
+    assert set(map(id, first_images)) == set(map(id, second_images))
+
+
+def test_platform_is_kept_inside_edges_before_ball_release():
+    platform = entity.Platform(None, pygame.Rect(95, 50, 15, 5), pygame.Vector2(5, 0))
+
+    tested_level = _make_level(
+        (), platform, entity.Ball(None, _BALL_RECT.copy(), _BALL_SPEED.copy())
+    )
+
+    tested_level.update()
+
+    assert not tested_level.get_game_state().is_ball_released
+    assert platform.rect.right == 100